@@ -49,6 +49,12 @@ class AccessLogGenerator:
                 request="WSDISCONNECT %(path)s" % details,
             )
 
+    def flush(self):
+        """
+        Flushes any buffered entries out to the underlying stream.
+        """
+        self.stream.flush()
+
     def write_entry(
         self, host, date, request, status=None, length=None, ident=None, user=None
     ):
@@ -1,239 +1,546 @@
-import argparse
+import atexit
+import importlib
 import logging
 import os
 import sys
-from argparse import ArgumentError, Namespace
-
-from asgiref.compatibility import guarantee_single_callable
-
-from .access import AccessLogGenerator
-from .endpoints import build_endpoint_description_strings
-from .server import Server
-from .utils import import_by_path
+from types import SimpleNamespace
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 8000
 
+DEFAULT_LOG_FORMAT = "%(asctime)-15s %(levelname)-8s %(message)s"
+_DEFAULT_FORMATTER = logging.Formatter(DEFAULT_LOG_FORMAT)
 
-class CommandLineInterface:
-    """
-    Acts as the main CLI entry point for running the server.
-    """
+# Log levels for verbosity 0-3; higher values are treated as 3
+_VERBOSITY_LEVELS = (
+    logging.WARN,
+    logging.INFO,
+    logging.DEBUG,
+    logging.DEBUG,  # Also turns on asyncio debug
+)
 
-    description = "Django HTTP/WebSocket server"
+# The server stack (Twisted, asgiref) is only imported once we actually run,
+# so that things like ``daphne --help`` return quickly. These names used to
+# be imported here, so keep them reachable as module attributes.
+_LAZY_IMPORTS = {
+    "argparse": "argparse",
+    "ArgumentError": "argparse",
+    "Namespace": "argparse",
+    "guarantee_single_callable": "asgiref.compatibility",
+    "AccessLogGenerator": "daphne.access",
+    "build_endpoint_description_strings": "daphne.endpoints",
+    "Server": "daphne.server",
+    "import_by_path": "daphne.utils",
+}
 
-    server_class = Server
 
-    def __init__(self):
-        self.parser = argparse.ArgumentParser(description=self.description)
-        self.parser.add_argument(
-            "-p", "--port", type=int, help="Port number to listen on", default=None
-        )
-        self.parser.add_argument(
-            "-b",
-            "--bind",
-            dest="host",
-            help="The host/address to bind to",
-            default=None,
-        )
-        self.parser.add_argument(
-            "--websocket_timeout",
-            type=int,
-            help="Maximum time to allow a websocket to be connected. -1 for infinite.",
-            default=86400,
-        )
-        self.parser.add_argument(
-            "--websocket_connect_timeout",
-            type=int,
-            help="Maximum time to allow a connection to handshake. -1 for infinite",
-            default=5,
-        )
-        self.parser.add_argument(
-            "-u",
-            "--unix-socket",
-            dest="unix_socket",
-            help="Bind to a UNIX socket rather than a TCP host/port",
-            default=None,
-        )
-        self.parser.add_argument(
-            "--fd",
-            type=int,
-            dest="file_descriptor",
-            help="Bind to a file descriptor rather than a TCP host/port or named unix socket",
-            default=None,
-        )
-        self.parser.add_argument(
-            "-e",
-            "--endpoint",
-            dest="socket_strings",
-            action="append",
-            help="Use raw server strings passed directly to twisted",
-            default=[],
-        )
-        self.parser.add_argument(
-            "-v",
-            "--verbosity",
-            type=int,
-            help="How verbose to make the output",
-            default=1,
-        )
-        self.parser.add_argument(
-            "-t",
-            "--http-timeout",
-            type=int,
-            help="How long to wait for worker before timing out HTTP connections",
-            default=None,
-        )
-        self.parser.add_argument(
-            "--access-log",
-            help="Where to write the access log (- for stdout, the default for verbosity=1)",
-            default=None,
-        )
-        self.parser.add_argument(
-            "--log-fmt",
-            help="Log format to use",
-            default="%(asctime)-15s %(levelname)-8s %(message)s",
-        )
-        self.parser.add_argument(
-            "--ping-interval",
-            type=int,
-            help="The number of seconds a WebSocket must be idle before a keepalive ping is sent",
-            default=20,
-        )
-        self.parser.add_argument(
-            "--ping-timeout",
-            type=int,
-            help="The number of seconds before a WebSocket is closed if no response to a keepalive ping",
-            default=30,
-        )
-        self.parser.add_argument(
-            "--application-close-timeout",
-            type=int,
-            help="The number of seconds an ASGI application has to exit after client disconnect before it is killed",
-            default=10,
-        )
-        self.parser.add_argument(
-            "--root-path",
-            dest="root_path",
-            help="The setting for the ASGI root_path variable",
-            default="",
-        )
-        self.parser.add_argument(
-            "--proxy-headers",
-            dest="proxy_headers",
-            help="Enable parsing and using of X-Forwarded-For and X-Forwarded-Port headers and using that as the "
+def __getattr__(name):
+    try:
+        module_path = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_path)
+    if name == module_path:
+        return module
+    return getattr(module, name)
+
+
+# The command line options, as (flags, ArgumentParser.add_argument() kwargs).
+# Options always give their dest explicitly, so _parse_args doesn't have to
+# derive it the way argparse does.
+_ARGUMENTS = (
+    (
+        ("-p", "--port"),
+        {
+            "dest": "port",
+            "type": int,
+            "help": "Port number to listen on",
+            "default": None,
+        },
+    ),
+    (
+        ("-b", "--bind"),
+        {"dest": "host", "help": "The host/address to bind to", "default": None},
+    ),
+    (
+        ("--websocket_timeout",),
+        {
+            "dest": "websocket_timeout",
+            "type": int,
+            "help": "Maximum time to allow a websocket to be connected. -1 for infinite.",
+            "default": 86400,
+        },
+    ),
+    (
+        ("--websocket_connect_timeout",),
+        {
+            "dest": "websocket_connect_timeout",
+            "type": int,
+            "help": "Maximum time to allow a connection to handshake. -1 for infinite",
+            "default": 5,
+        },
+    ),
+    (
+        ("-u", "--unix-socket"),
+        {
+            "dest": "unix_socket",
+            "help": "Bind to a UNIX socket rather than a TCP host/port",
+            "default": None,
+        },
+    ),
+    (
+        ("--fd",),
+        {
+            "type": int,
+            "dest": "file_descriptor",
+            "help": "Bind to a file descriptor rather than a TCP host/port or named unix socket",
+            "default": None,
+        },
+    ),
+    (
+        ("-e", "--endpoint"),
+        {
+            "dest": "socket_strings",
+            "action": "append",
+            "help": "Use raw server strings passed directly to twisted",
+            "default": [],
+        },
+    ),
+    (
+        ("-v", "--verbosity"),
+        {
+            "dest": "verbosity",
+            "type": int,
+            "help": "How verbose to make the output",
+            "default": 1,
+        },
+    ),
+    (
+        ("-t", "--http-timeout"),
+        {
+            "dest": "http_timeout",
+            "type": int,
+            "help": "How long to wait for worker before timing out HTTP connections",
+            "default": None,
+        },
+    ),
+    (
+        ("--access-log",),
+        {
+            "dest": "access_log",
+            "help": "Where to write the access log (- for stdout, the default for verbosity=1)",
+            "default": None,
+        },
+    ),
+    (
+        ("--log-fmt",),
+        {
+            "dest": "log_fmt",
+            "help": "Log format to use",
+            "default": DEFAULT_LOG_FORMAT,
+        },
+    ),
+    (
+        ("--ping-interval",),
+        {
+            "dest": "ping_interval",
+            "type": int,
+            "help": "The number of seconds a WebSocket must be idle before a keepalive ping is sent",
+            "default": 20,
+        },
+    ),
+    (
+        ("--ping-timeout",),
+        {
+            "dest": "ping_timeout",
+            "type": int,
+            "help": "The number of seconds before a WebSocket is closed if no response to a keepalive ping",
+            "default": 30,
+        },
+    ),
+    (
+        ("--application-close-timeout",),
+        {
+            "dest": "application_close_timeout",
+            "type": int,
+            "help": "The number of seconds an ASGI application has to exit after client disconnect before it is killed",
+            "default": 10,
+        },
+    ),
+    (
+        ("--root-path",),
+        {
+            "dest": "root_path",
+            "help": "The setting for the ASGI root_path variable",
+            "default": "",
+        },
+    ),
+    (
+        ("--proxy-headers",),
+        {
+            "dest": "proxy_headers",
+            "help": "Enable parsing and using of X-Forwarded-For and X-Forwarded-Port headers and using that as the "
             "client address",
-            default=False,
-            action="store_true",
-        )
-        self.arg_proxy_host = self.parser.add_argument(
-            "--proxy-headers-host",
-            dest="proxy_headers_host",
-            help="Specify which header will be used for getting the host "
+            "default": False,
+            "action": "store_true",
+        },
+    ),
+    (
+        ("--proxy-headers-host",),
+        {
+            "dest": "proxy_headers_host",
+            "help": "Specify which header will be used for getting the host "
             "part. Can be omitted, requires --proxy-headers to be specified "
             'when passed. "X-Real-IP" (when passed by your webserver) is a '
             "good candidate for this.",
-            default=False,
-            action="store",
-        )
-        self.arg_proxy_port = self.parser.add_argument(
-            "--proxy-headers-port",
-            dest="proxy_headers_port",
-            help="Specify which header will be used for getting the port "
+            "default": False,
+            "action": "store",
+        },
+    ),
+    (
+        ("--proxy-headers-port",),
+        {
+            "dest": "proxy_headers_port",
+            "help": "Specify which header will be used for getting the port "
             "part. Can be omitted, requires --proxy-headers to be specified "
             "when passed.",
-            default=False,
-            action="store",
-        )
-        self.parser.add_argument(
-            "application",
-            help="The application to dispatch to as path.to.module:instance.path",
-        )
-        self.parser.add_argument(
-            "-s",
-            "--server-name",
-            dest="server_name",
-            help="specify which value should be passed to response header Server attribute",
-            default="daphne",
-        )
-        self.parser.add_argument(
-            "--no-server-name", dest="server_name", action="store_const", const=""
-        )
+            "default": False,
+            "action": "store",
+        },
+    ),
+    (
+        ("application",),
+        {"help": "The application to dispatch to as path.to.module:instance.path"},
+    ),
+    (
+        ("-s", "--server-name"),
+        {
+            "dest": "server_name",
+            "help": "specify which value should be passed to response header Server attribute",
+            "default": "daphne",
+        },
+    ),
+    (
+        ("--no-server-name",),
+        {"dest": "server_name", "action": "store_const", "const": ""},
+    ),
+)
+
+
+def _build_option_table():
+    """
+    Flattens _ARGUMENTS into a {flag: (dest, action, type or const)} dict for
+    _parse_args, plus the {dest: default} dict it starts from.
+    """
+    options = {}
+    defaults = {}
+    for flags, kwargs in _ARGUMENTS:
+        if not flags[0].startswith("-"):
+            # The positional application argument, which has no default
+            continue
+        dest = kwargs["dest"]
+        action = kwargs.get("action", "store")
+        if action == "store_true":
+            value = True
+        elif action == "store_const":
+            value = kwargs["const"]
+        else:
+            value = kwargs.get("type")
+        # Flags and dests are looked up on every parse, so intern them
+        for flag in flags:
+            options[sys.intern(flag)] = (sys.intern(dest), action, value)
+        defaults.setdefault(dest, kwargs.get("default"))
+    return options, defaults
+
+
+_OPTIONS, _DEFAULTS = _build_option_table()
+
+
+def _parse_args(args):
+    """
+    Parses a command line in a single pass over the option table, without
+    going through (or even importing) argparse.
+
+    Only the plain "--flag value" forms are handled here; anything else
+    (--help, --flag=value, abbreviated or unknown flags, bad values, a
+    missing application...) returns None so that argparse can deal with it
+    and produce its usual output.
+    """
+    namespace = SimpleNamespace(**_DEFAULTS)
+    # Don't share the mutable default between parses
+    namespace.socket_strings = []
+    application = None
+    index = 0
+    count = len(args)
+    while index < count:
+        arg = args[index]
+        index += 1
+        option = _OPTIONS.get(arg)
+        if option is None:
+            if arg.startswith("-") or application is not None:
+                return None
+            application = arg
+            continue
+        dest, action, value = option
+        if action in ("store_true", "store_const"):
+            setattr(namespace, dest, value)
+            continue
+        if index == count:
+            return None
+        raw_value = args[index]
+        index += 1
+        # argparse has its own rules for values that look like flags
+        # (negative numbers, "--"); only "-" (stdout) is plainly a value
+        if raw_value.startswith("-") and raw_value != "-":
+            return None
+        if value is not None:
+            try:
+                raw_value = value(raw_value)
+            except ValueError:
+                return None
+        if action == "append":
+            getattr(namespace, dest).append(raw_value)
+        else:
+            setattr(namespace, dest, raw_value)
+    if application is None:
+        return None
+    namespace.application = application
+    return namespace
+
+
+# Access log files opened by the CLI, by absolute path, so that re-runs reuse
+# them and one exit hook closes them all
+_access_log_streams = {}
+
+
+def _open_access_log(path):
+    """
+    Returns the stream for the access log at path, opening it if needed.
+    It's block buffered rather than line buffered, to avoid a write per
+    request; the server flushes it periodically.
+    """
+    path = os.path.abspath(path)
+    stream = _access_log_streams.get(path)
+    if stream is None or stream.closed:
+        if not _access_log_streams:
+            atexit.register(_close_access_logs)
+        stream = _access_log_streams[path] = open(path, "a", buffering=8192)
+    return stream
+
+
+def _close_access_logs():
+    for stream in _access_log_streams.values():
+        stream.close()
+
+
+def _check_proxy_headers_passed(cli, argument: str, args):
+    """Raise if the `--proxy-headers` weren't specified."""
+    if args.proxy_headers:
+        return
+    from argparse import ArgumentError
+
+    # The action to report against is kept alongside the parser; fall back
+    # to the shared one if this instance doesn't have its own
+    action = getattr(cli, argument, None)
+    if action is None:
+        type(cli)._build_parser()
+        action = getattr(cli, argument)
+    raise ArgumentError(
+        argument=action,
+        message="--proxy-headers has to be passed for this parameter.",
+    )
+
 
+def _get_forwarded_host(args, cli):
+    """
+    Return the default host header from which the remote hostname/ip
+    will be extracted.
+    """
+    if args.proxy_headers_host:
+        _check_proxy_headers_passed(cli, "arg_proxy_host", args)
+        return args.proxy_headers_host
+    if args.proxy_headers:
+        return "X-Forwarded-For"
+
+
+def _get_forwarded_port(args, cli):
+    """
+    Return the default port header from which the remote port
+    will be extracted.
+    """
+    if args.proxy_headers_port:
+        _check_proxy_headers_passed(cli, "arg_proxy_port", args)
+        return args.proxy_headers_port
+    if args.proxy_headers:
+        return "X-Forwarded-Port"
+
+
+# ----- Custom fork code start -----
+# Daphne allows you to pass in ready_callable - but doesn't actually expose it for you to define!
+# So this is yet another piece we need in our custom fork.
+def _ready_callable():
+    # touch app-initialized when server is started
+    # this is so that Heroku acknowledges that the server is up and running
+    # https://github.com/heroku/heroku-buildpack-nginx/blob/main/bin/start-nginx#L41-L53
+    open("/tmp/app-initialized", "w").close()
+
+
+# ----- Custom fork code end -----
+
+
+class _DefaultServerClass:
+    """
+    Class attribute that resolves to daphne.server.Server when read, so the
+    server stack is only imported once something needs it. Subclasses
+    replace it by setting server_class as usual.
+    """
+
+    def __get__(self, instance, owner):
+        from .server import Server
+
+        return Server
+
+
+class CommandLineInterface:
+    """
+    Acts as the main CLI entry point for running the server.
+    """
+
+    description = "Django HTTP/WebSocket server"
+
+    server_class = _DefaultServerClass()
+
+    # This instance's own parser, once it has asked for or been given one
+    _parser = None
+
+    def __init__(self):
         self.server = None
 
+    @property
+    def parser(self):
+        """
+        This instance's argument parser, built on first access. It belongs to
+        the instance, so it's safe to customise; instances that never touch it
+        use the class's shared parser instead (see _build_parser).
+        """
+        if self._parser is None:
+            self._parser, actions = type(self)._create_parser()
+            self.arg_proxy_host = actions["--proxy-headers-host"]
+            self.arg_proxy_port = actions["--proxy-headers-port"]
+        return self._parser
+
+    @parser.setter
+    def parser(self, parser):
+        self._parser = parser
+
     @classmethod
-    def entrypoint(cls):
+    def _create_parser(cls):
         """
-        Main entrypoint for external starts.
+        Builds a new argument parser, returning it along with its actions
+        keyed by their last flag.
         """
-        cls().run(sys.argv[1:])
+        import argparse
 
-    def _check_proxy_headers_passed(self, argument: str, args: Namespace):
-        """Raise if the `--proxy-headers` weren't specified."""
-        if args.proxy_headers:
-            return
-        raise ArgumentError(
-            argument=argument,
-            message="--proxy-headers has to be passed for this parameter.",
-        )
+        parser = argparse.ArgumentParser(description=cls.description)
+        actions = {}
+        for flags, kwargs in _ARGUMENTS:
+            actions[flags[-1]] = parser.add_argument(*flags, **kwargs)
+        return parser, actions
+
+    @classmethod
+    def _build_parser(cls):
+        """
+        Returns the argument parser shared by this class's instances that
+        don't have their own, building it on first use. Parsing doesn't
+        modify it, and nothing else should: customise an instance's parser
+        instead.
+        """
+        parser = cls.__dict__.get("_parser_cache")
+        if parser is None:
+            parser, actions = cls._create_parser()
+            cls.arg_proxy_host = actions["--proxy-headers-host"]
+            cls.arg_proxy_port = actions["--proxy-headers-port"]
+            cls._parser_cache = parser
+        return parser
 
-    def _get_forwarded_host(self, args: Namespace):
+    def _uses_stock_parser(self):
         """
-        Return the default host header from which the remote hostname/ip
-        will be extracted.
+        Whether this instance's command line is exactly the one described by
+        _ARGUMENTS, so run() can read it without argparse; not the case if
+        the instance has its own (possibly customised) parser, or the class
+        builds its parser differently.
         """
-        if args.proxy_headers_host:
-            self._check_proxy_headers_passed(argument=self.arg_proxy_host, args=args)
-            return args.proxy_headers_host
-        if args.proxy_headers:
-            return "X-Forwarded-For"
+        cls = type(self)
+        return (
+            self._parser is None
+            and cls._create_parser.__func__
+            is CommandLineInterface._create_parser.__func__
+            and cls._build_parser.__func__
+            is CommandLineInterface._build_parser.__func__
+        )
 
-    def _get_forwarded_port(self, args: Namespace):
+    @classmethod
+    def entrypoint(cls):
         """
-        Return the default host header from which the remote hostname/ip
-        will be extracted.
+        Main entrypoint for external starts.
         """
-        if args.proxy_headers_port:
-            self._check_proxy_headers_passed(argument=self.arg_proxy_port, args=args)
-            return args.proxy_headers_port
-        if args.proxy_headers:
-            return "X-Forwarded-Port"
+        cls().run(sys.argv[1:])
 
     def run(self, args):
         """
         Pass in raw argument list and it will decode them
         and run the server.
         """
-        # Decode args
-        args = self.parser.parse_args(args)
-        # Set up logging
-        logging.basicConfig(
-            level={
-                0: logging.WARN,
-                1: logging.INFO,
-                2: logging.DEBUG,
-                3: logging.DEBUG,  # Also turns on asyncio debug
-            }[args.verbosity],
-            format=args.log_fmt,
+        # Decode args, leaving anything unusual (and --help) to argparse
+        parsed_args = _parse_args(args) if self._uses_stock_parser() else None
+        if parsed_args is None:
+            parser = self._parser
+            if parser is None:
+                parser = type(self)._build_parser()
+            parsed_args = parser.parse_args(args)
+        args = parsed_args
+        # Only now pull in the server stack
+        from asgiref.compatibility import guarantee_single_callable
+
+        from .access import AccessLogGenerator
+        from .endpoints import (
+            build_fd_endpoint,
+            build_tcp_endpoint,
+            build_unix_endpoint,
         )
+        from .utils import import_by_path
+
+        # Set up logging, unless whatever is embedding us already has
+        level = _VERBOSITY_LEVELS[max(0, min(args.verbosity, 3))]
+        if logging.root.handlers:
+            logging.root.setLevel(level)
+        elif args.log_fmt == DEFAULT_LOG_FORMAT:
+            # What basicConfig() does, reusing the prebuilt formatter
+            handler = logging.StreamHandler()
+            handler.setFormatter(_DEFAULT_FORMATTER)
+            logging.root.addHandler(handler)
+            logging.root.setLevel(level)
+        else:
+            logging.basicConfig(level=level, format=args.log_fmt)
         # If verbosity is 1 or greater, or they told us explicitly, set up access log
         access_log_stream = None
         if args.access_log:
             if args.access_log == "-":
                 access_log_stream = sys.stdout
             else:
-                access_log_stream = open(args.access_log, "a", 1)
+                access_log_stream = _open_access_log(args.access_log)
         elif args.verbosity >= 1:
             access_log_stream = sys.stdout
 
         # ----- Custom fork code start -----
         # default directory on Heroku is /app/, but we want to import the application from within /app/django-root/
         original_working_dir = os.getcwd()
-        os.chdir("django-root")
-        sys.path.insert(0, os.getcwd())
+        application_dir = os.path.join(original_working_dir, "django-root")
+        os.chdir(application_dir)
+        if application_dir not in sys.path:
+            sys.path.insert(0, application_dir)
         # ----- Custom fork code end -----
 
         # Import application
@@ -244,46 +551,45 @@ class CommandLineInterface:
         # ----- Custom fork code start -----
         # Change back out of django-root so that everything else runs as daphne expects
         os.chdir(original_working_dir)
-        sys.path.insert(0, ".")
+        # Only add the current directory once, however many times we run
+        if "" not in sys.path and "." not in sys.path:
+            sys.path.insert(0, "")
         # ----- Custom fork code end -----
 
         # Set up port/host bindings
-        if not any(
-            [
-                args.host,
-                args.port is not None,
-                args.unix_socket,
-                args.file_descriptor is not None,
-                args.socket_strings,
-            ]
+        if not (
+            args.host
+            or args.port is not None
+            or args.unix_socket
+            or args.file_descriptor is not None
+            or args.socket_strings
         ):
             # no advanced binding options passed, patch in defaults
             args.host = DEFAULT_HOST
             args.port = DEFAULT_PORT
-        elif args.host and args.port is None:
-            args.port = DEFAULT_PORT
-        elif args.port is not None and not args.host:
-            args.host = DEFAULT_HOST
-        # Build endpoint description strings from (optional) cli arguments
-        endpoints = build_endpoint_description_strings(
-            host=args.host,
-            port=args.port,
-            unix_socket=args.unix_socket,
-            file_descriptor=args.file_descriptor,
-        )
-        endpoints = sorted(args.socket_strings + endpoints)
+        elif args.host or args.port is not None:
+            # only half of a TCP binding passed, fill in the other half
+            args.host = args.host or DEFAULT_HOST
+            args.port = DEFAULT_PORT if args.port is None else args.port
+        # Build endpoint description strings from (optional) cli arguments,
+        # alongside the raw ones; socket_strings itself is copied, as it may
+        # be the parser's shared default list
+        endpoints = list(args.socket_strings)
+        if args.host:
+            endpoints.append(build_tcp_endpoint(args.host, args.port))
+        if args.unix_socket:
+            endpoints.append(build_unix_endpoint(args.unix_socket))
+        if args.file_descriptor is not None:
+            endpoints.append(build_fd_endpoint(args.file_descriptor))
+        endpoints.sort()
         # Start the server
-        logger.info("Starting server at {}".format(", ".join(endpoints)))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Starting server at %s", ", ".join(endpoints))
 
-        # ----- Custom fork code start -----
-        # Daphne allows you to pass in ready_callable - but doesn't actually expose it for you to define!
-        # So this is yet another piece we need in our custom fork.
-        def ready_callable():
-            # touch app-initialized when server is started
-            # this is so that Heroku acknowledges that the server is up and running
-            # https://github.com/heroku/heroku-buildpack-nginx/blob/main/bin/start-nginx#L41-L53
-            open("/tmp/app-initialized", "w").close()
-        # ----- Custom fork code end -----
+        # Only build an access logger if there's somewhere to write to
+        action_logger = None
+        if access_log_stream is not None:
+            action_logger = AccessLogGenerator(access_log_stream)
 
         self.server = self.server_class(
             application=application,
@@ -295,17 +601,15 @@ class CommandLineInterface:
             websocket_connect_timeout=args.websocket_connect_timeout,
             websocket_handshake_timeout=args.websocket_connect_timeout,
             application_close_timeout=args.application_close_timeout,
-            action_logger=AccessLogGenerator(access_log_stream)
-            if access_log_stream
-            else None,
+            action_logger=action_logger,
             root_path=args.root_path,
             verbosity=args.verbosity,
-            proxy_forwarded_address_header=self._get_forwarded_host(args=args),
-            proxy_forwarded_port_header=self._get_forwarded_port(args=args),
+            proxy_forwarded_address_header=_get_forwarded_host(args, self),
+            proxy_forwarded_port_header=_get_forwarded_port(args, self),
             proxy_forwarded_proto_header="X-Forwarded-Proto"
             if args.proxy_headers
             else None,
             server_name=args.server_name,
-            ready_callable=ready_callable,  # Custom fork: make sure we pass ready_callable through
+            ready_callable=_ready_callable,  # Custom fork: make sure we pass ready_callable through
         )
         self.server.run()
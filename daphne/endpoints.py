@@ -1,3 +1,25 @@
+def build_tcp_endpoint(host, port):
+    """
+    Build the twisted endpoint description string for a TCP host/port binding.
+    """
+    host = host.strip("[]").replace(":", r"\:")
+    return "tcp:port=%d:interface=%s" % (int(port), host)
+
+
+def build_unix_endpoint(path):
+    """
+    Build the twisted endpoint description string for a UNIX socket binding.
+    """
+    return "unix:%s" % path
+
+
+def build_fd_endpoint(file_descriptor):
+    """
+    Build the twisted endpoint description string for a file descriptor binding.
+    """
+    return "fd:fileno=%d" % int(file_descriptor)
+
+
 def build_endpoint_description_strings(
     host=None, port=None, unix_socket=None, file_descriptor=None
 ):
@@ -8,15 +30,14 @@ def build_endpoint_description_strings(
     """
     socket_descriptions = []
     if host and port is not None:
-        host = host.strip("[]").replace(":", r"\:")
-        socket_descriptions.append("tcp:port=%d:interface=%s" % (int(port), host))
+        socket_descriptions.append(build_tcp_endpoint(host, port))
     elif any([host, port]):
         raise ValueError("TCP binding requires both port and host kwargs.")
 
     if unix_socket:
-        socket_descriptions.append("unix:%s" % unix_socket)
+        socket_descriptions.append(build_unix_endpoint(unix_socket))
 
     if file_descriptor is not None:
-        socket_descriptions.append("fd:fileno=%d" % int(file_descriptor))
+        socket_descriptions.append(build_fd_endpoint(file_descriptor))
 
     return socket_descriptions
@@ -123,6 +123,9 @@ class Server:
         # Kick off the timeout loop
         reactor.callLater(1, self.application_checker)
         reactor.callLater(2, self.timeout_checker)
+        # Flush the action logger's output regularly, if it buffers any
+        if hasattr(self.action_logger, "flush"):
+            reactor.callLater(1, self.action_logger_flusher)
 
         for socket_description in self.endpoints:
             logger.info("Configuring endpoint %s", socket_description)
@@ -333,6 +336,13 @@ class Server:
             protocol.check_timeouts()
         reactor.callLater(2, self.timeout_checker)
 
+    def action_logger_flusher(self):
+        """
+        Called periodically to flush any buffered action logger output.
+        """
+        self.action_logger.flush()
+        reactor.callLater(1, self.action_logger_flusher)
+
     def log_action(self, protocol, action, details):
         """
         Dispatches to any registered action logger, if there is one.
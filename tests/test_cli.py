@@ -1,10 +1,15 @@
+import argparse
 import logging
 import os
+import sys
+import tempfile
 from argparse import ArgumentError
 from unittest import TestCase, skipUnless
 
-from daphne.cli import CommandLineInterface
+from daphne import cli
+from daphne.cli import CommandLineInterface, _parse_args
 from daphne.endpoints import build_endpoint_description_strings as build
+from daphne.endpoints import build_fd_endpoint, build_tcp_endpoint, build_unix_endpoint
 
 
 class TestEndpointDescriptions(TestCase):
@@ -45,6 +50,20 @@ class TestEndpointDescriptions(TestCase):
     def testFileDescriptorBinding(self):
         self.assertEqual(build(file_descriptor=5), ["fd:fileno=5"])
 
+    def testSingleEndpointBuilders(self):
+        self.assertEqual(
+            build_tcp_endpoint("example.com", 1234),
+            "tcp:port=1234:interface=example.com",
+        )
+        self.assertEqual(
+            build_tcp_endpoint("[200a::1]", "8000"),
+            r"tcp:port=8000:interface=200a\:\:1",
+        )
+        self.assertEqual(
+            build_unix_endpoint("/tmp/daphne.sock"), "unix:/tmp/daphne.sock"
+        )
+        self.assertEqual(build_fd_endpoint("5"), "fd:fileno=5")
+
     def testMultipleEnpoints(self):
         self.assertEqual(
             sorted(
@@ -257,6 +276,185 @@ class TestCLIInterface(TestCase):
         """
         self.assertCLI(["--no-server-name"], {"server_name": ""})
 
+    def test_access_log_verbosity(self):
+        """
+        The access log goes to stdout by default, and is off at verbosity 0
+        unless `--access-log` is passed.
+        """
+        instance = self.TestedCLI()
+        instance.run(["daphne:__version__"])
+        self.assertIs(instance.server.init_kwargs["action_logger"].stream, sys.stdout)
+        self.assertCLI(["-v", "0"], {"action_logger": None})
+        instance.run(["-v", "0", "--access-log", "-", "daphne:__version__"])
+        self.assertIs(instance.server.init_kwargs["action_logger"].stream, sys.stdout)
+
+    def test_access_log_file(self):
+        """
+        Passing `--access-log` with a path writes a block-buffered access
+        log to that file.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "access.log")
+            instance = self.TestedCLI()
+            instance.run(["--access-log", path, "daphne:__version__"])
+            stream = instance.server.init_kwargs["action_logger"].stream
+            self.assertEqual(stream.name, path)
+            self.assertFalse(stream.line_buffering)
+            # Running again reuses the open file
+            instance.run(["--access-log", path, "daphne:__version__"])
+            self.assertIs(instance.server.init_kwargs["action_logger"].stream, stream)
+            stream.close()
+
+    def test_logging_setup(self):
+        """
+        Logging is set up with the default formatter unless a format is
+        passed, and left alone (apart from the level) if already configured.
+        """
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        try:
+            root.handlers = []
+            self.assertCLI([], {})
+            self.assertEqual(len(root.handlers), 1)
+            self.assertIs(root.handlers[0].formatter, cli._DEFAULT_FORMATTER)
+            self.assertEqual(root.level, logging.INFO)
+
+            root.handlers = []
+            self.assertCLI(["--log-fmt", "%(message)s"], {})
+            self.assertEqual(len(root.handlers), 1)
+            self.assertEqual(root.handlers[0].formatter._fmt, "%(message)s")
+
+            self.assertCLI(["-v", "2"], {})
+            self.assertEqual(len(root.handlers), 1)
+            self.assertEqual(root.level, logging.DEBUG)
+        finally:
+            root.handlers = handlers
+            root.setLevel(level)
+
+    def test_sys_path_unchanged_on_rerun(self):
+        """
+        Running the CLI again doesn't keep growing sys.path.
+        """
+        self.assertCLI([], {})
+        path = sys.path[:]
+        self.assertCLI([], {})
+        self.assertEqual(sys.path, path)
+
+    def test_verbosity_out_of_range(self):
+        """
+        Verbosity levels above 3 behave like 3 rather than erroring.
+        """
+        self.assertCLI(["-v", "5"], {"verbosity": 5})
+
+    def test_fast_parse_matches_argparse(self):
+        """
+        The single-pass parser produces the same namespace as argparse for
+        the command lines it handles.
+        """
+        parser = CommandLineInterface().parser
+        for args in [
+            ["app:application"],
+            ["-p", "8080", "-b", "example.com", "app:application"],
+            ["app:application", "-u", "/tmp/daphne.sock", "--fd", "5"],
+            ["-e", "imap:", "--endpoint", "unix:/tmp/daphne.sock", "app:app"],
+            ["--access-log", "-", "-v", "2", "--proxy-headers", "app:app"],
+            ["--proxy-headers-host", "X-Real-IP", "--root-path", "", "app:app"],
+            ["--server-name", "python", "--no-server-name", "app:app"],
+        ]:
+            with self.subTest(args=args):
+                self.assertEqual(vars(_parse_args(args)), vars(parser.parse_args(args)))
+
+    def test_fast_parse_fallback(self):
+        """
+        The single-pass parser leaves anything unusual to argparse.
+        """
+        for args in [
+            [],
+            ["--help"],
+            ["--port=8080", "app:app"],
+            ["--verb", "2", "app:app"],
+            ["-p", "abc", "app:app"],
+            ["--websocket_timeout", "-1", "app:app"],
+            ["app:app", "-p"],
+            ["app:app", "other:app"],
+        ]:
+            with self.subTest(args=args):
+                self.assertIsNone(_parse_args(args))
+
+    def test_customised_parser_not_fast_parsed(self):
+        """
+        Changes a subclass makes to its parser are honoured, rather than
+        skipped by the single-pass parser.
+        """
+
+        class DefaultsCLI(self.TestedCLI):
+            def __init__(self):
+                super().__init__()
+                self.parser.set_defaults(port=9000)
+
+        class BuiltCLI(self.TestedCLI):
+            @classmethod
+            def _create_parser(cls):
+                parser, actions = super()._create_parser()
+                parser.set_defaults(port=9001)
+                return parser, actions
+
+        for cli_class, port in [(DefaultsCLI, 9000), (BuiltCLI, 9001)]:
+            with self.subTest(cli_class=cli_class.__name__):
+                instance = cli_class()
+                instance.run(["daphne:__version__"])
+                self.assertEqual(
+                    instance.server.init_kwargs["endpoints"],
+                    ["tcp:port=%d:interface=127.0.0.1" % port],
+                )
+        self.assertTrue(self.TestedCLI()._uses_stock_parser())
+
+    def test_parser_cached(self):
+        """
+        The shared argument parser is built once per class, while instances
+        that ask for a parser get their own.
+        """
+        self.assertIs(self.TestedCLI._build_parser(), self.TestedCLI._build_parser())
+        self.assertIsNot(
+            CommandLineInterface._build_parser(), self.TestedCLI._build_parser()
+        )
+        self.assertIsNot(self.TestedCLI().parser, self.TestedCLI().parser)
+
+    def test_customised_parser(self):
+        """
+        Subclasses can customise or replace their instance's parser.
+        """
+
+        class ExtraCLI(self.TestedCLI):
+            def __init__(self):
+                super().__init__()
+                self.parser.add_argument("--extra", default="x")
+
+        class ReplacedCLI(self.TestedCLI):
+            def __init__(self):
+                super().__init__()
+                self.parser = argparse.ArgumentParser()
+
+        # Adding an argument again on a second instance doesn't conflict
+        ExtraCLI()
+        self.assertEqual(ExtraCLI().parser.parse_args(["app"]).extra, "x")
+        self.assertIsNot(ReplacedCLI().parser, self.TestedCLI._build_parser())
+
+    def test_default_server_class(self):
+        """
+        The default server class is imported lazily, and still reachable
+        from the module for backwards compatibility.
+        """
+        from daphne.server import Server
+
+        self.assertIs(CommandLineInterface.server_class, Server)
+        self.assertIs(CommandLineInterface().server_class, Server)
+        self.assertIs(self.TestedCLI.server_class, self.TestedCLI.TestedServer)
+        self.assertIs(cli.Server, Server)
+        self.assertIs(cli.argparse, argparse)
+        self.assertIs(cli.ArgumentError, ArgumentError)
+        self.assertIs(cli.Namespace, argparse.Namespace)
+
 
 @skipUnless(os.getenv("ASGI_THREADS"), "ASGI_THREADS environment variable not set.")
 class TestASGIThreads(TestCase):
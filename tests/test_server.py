@@ -0,0 +1,42 @@
+import datetime
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from daphne.access import AccessLogGenerator
+from daphne.server import Server
+
+
+class TestActionLoggerFlusher(TestCase):
+    """
+    Tests the periodic flushing of buffered action logger output.
+    """
+
+    def test_flush_writes_buffered_entries(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "access.log")
+            with open(path, "a", buffering=8192) as stream:
+                action_logger = AccessLogGenerator(stream)
+                server = Server(
+                    application=None,
+                    endpoints=["tcp:port=0"],
+                    action_logger=action_logger,
+                )
+                action_logger.write_entry(
+                    host="127.0.0.1",
+                    date=datetime.datetime(2022, 1, 1),
+                    request="GET /",
+                    status=200,
+                )
+                # Still sitting in the buffer
+                with open(path) as log_file:
+                    self.assertEqual(log_file.read(), "")
+                with mock.patch("daphne.server.reactor.callLater") as call_later:
+                    server.action_logger_flusher()
+                with open(path) as log_file:
+                    self.assertEqual(
+                        log_file.read(),
+                        '127.0.0.1 - - [01/Jan/2022:00:00:00] "GET /" 200 -\n',
+                    )
+                # And it reschedules itself
+                call_later.assert_called_once_with(1, server.action_logger_flusher)